@@ -1,5 +1,8 @@
+import math
+
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from scipy.optimize import linprog, minimize
 import data_loader
 
@@ -12,19 +15,81 @@ def portfolio_volatility(weights, cov_matrix):
     Calculates portfolio volatility using Covariance Matrix.
     Formula: sqrt( w^T * Cov * w )
     """
-    variance = weights.T @ cov_matrix @ weights
-    return np.sqrt(max(variance, 0.0))
+    variance = weights @ cov_matrix @ weights
+    return math.sqrt(max(variance, 0.0))
 
 def negative_sharpe_ratio(weights, expected_returns, cov_matrix, risk_free_rate):
     """
     Negative Sharpe Ratio for minimization.
+
+    SLSQP evaluates this hundreds of times per solve, so it works on plain
+    ndarrays with two BLAS dot products and a scalar sqrt — no np.sum
+    temporaries, no numpy-scalar ufunc dispatch.
     """
-    p_return = portfolio_expected_return(weights, expected_returns)
-    p_volatility = portfolio_volatility(weights, cov_matrix)
-    if p_volatility == 0:
+    p_return = weights @ expected_returns
+    p_variance = weights @ cov_matrix @ weights
+    if p_variance <= 0:
         return np.inf
-    sharpe = (p_return - risk_free_rate) / p_volatility
-    return -sharpe
+    return -(p_return - risk_free_rate) / math.sqrt(p_variance)
+
+def negative_sharpe_gradient(weights, expected_returns, cov_matrix, risk_free_rate):
+    """
+    Analytic gradient of negative_sharpe_ratio.
+    Formula: -( r / σ - (w·r - rf) * Cov w / σ³ ),  σ = sqrt( w^T * Cov * w )
+    """
+    return _negative_sharpe_and_gradient(weights, expected_returns, cov_matrix, risk_free_rate)[1]
+
+def _negative_sharpe_and_gradient(weights, expected_returns, cov_matrix, risk_free_rate):
+    """
+    (negative_sharpe_ratio, negative_sharpe_gradient) from a single Cov @ w
+    product. SLSQP asks for both at every point it visits, and the O(n²)
+    mat-vec is the only non-trivial cost in either, so share it.
+    """
+    cov_w = cov_matrix @ weights
+    p_variance = weights @ cov_w
+    if p_variance <= 0:
+        return np.inf, np.zeros_like(weights)
+    p_vol = math.sqrt(p_variance)
+    excess = weights @ expected_returns - risk_free_rate
+    grad = -(expected_returns / p_vol - excess * cov_w / (p_variance * p_vol))
+    return -excess / p_vol, grad
+
+def _linear_constraints(bonds_df, target_duration, max_junk_bond_allocation,
+                        max_sector_allocation, junk_bond_ratings):
+    """
+    Budget/duration equalities and junk/sector caps as stacked matrices:
+    A_eq @ w == b_eq and A_ub @ w <= b_ub (A_ub/b_ub are None if empty).
+    """
+    num_bonds = len(bonds_df)
+
+    A_eq = np.array([
+        np.ones(num_bonds),
+        bonds_df['Duration'].values
+    ], dtype=float)
+    b_eq = np.array([1.0, target_duration])
+
+    # One-hot sector indicator in a single scatter: row k marks the bonds in
+    # the k-th sector (first-appearance order, as Series.unique() gives).
+    sector_codes, sector_names = pd.factorize(bonds_df['Sector'].values)
+    has_sector = sector_codes >= 0
+    sector_rows = np.zeros((len(sector_names), num_bonds))
+    sector_rows[sector_codes[has_sector], np.flatnonzero(has_sector)] = 1.0
+
+    A_ub = sector_rows
+    b_ub = np.full(len(sector_rows), max_sector_allocation)
+
+    # Test the handful of distinct ratings, then gather by integer code
+    # instead of comparing every cell; the trailing False covers code -1.
+    rating_codes, rating_names = pd.factorize(bonds_df['Rating'].values)
+    junk_by_code = np.append(np.isin(rating_names, list(junk_bond_ratings)), False)
+    junk_row = junk_by_code[rating_codes].astype(float)
+    if junk_row.any():
+        A_ub = np.vstack([junk_row, A_ub])
+        b_ub = np.r_[max_junk_bond_allocation, b_ub]
+
+    if not len(A_ub):
+        return A_eq, b_eq, None, None
+    return A_eq, b_eq, A_ub, b_ub
 
 def run_solver(
     bonds_df, 
@@ -35,131 +100,146 @@ def run_solver(
     risk_free_rate=0.01,
     max_junk_bond_allocation=0.3, 
     max_sector_allocation=0.25, 
-    junk_bond_ratings=None
+    junk_bond_ratings=None,
+    cov_matrix=None,
+    initial_weights=None
 ):
     """
     Solves the optimization problem based on the selected objective and constraints.
+    A precomputed `cov_matrix` for `bonds_df` may be passed to skip rebuilding it,
+    and `initial_weights` warm-starts the Sharpe solve (equal weights if None).
     """
+    if cov_matrix is None:
+        cov_matrix = data_loader.generate_covariance_matrix(bonds_df)
+
+    weights, error = _solve_weights(
+        bonds_df, target_duration, max_allocation, objective_type,
+        risk_free_rate, max_junk_bond_allocation, max_sector_allocation,
+        junk_bond_ratings, cov_matrix, initial_weights,
+    )
+    if weights is None:
+        return None, error
+    return _summarize(bonds_df, weights, capital, cov_matrix, risk_free_rate)
+
+
+def _solve_weights(
+    bonds_df, target_duration, max_allocation, objective_type, risk_free_rate,
+    max_junk_bond_allocation, max_sector_allocation, junk_bond_ratings,
+    cov_matrix, initial_weights,
+):
+    """Raw solver weights (one per row of `bonds_df`), or (None, error message)."""
     num_bonds = len(bonds_df)
     
     if junk_bond_ratings is None:
         junk_bond_ratings = ["BB", "B", "CCC", "D"]
 
-    cov_matrix = data_loader.generate_covariance_matrix(bonds_df)
-    bounds = [(0.0, max_allocation) for _ in range(num_bonds)]
+    yields = np.ascontiguousarray(bonds_df['Yield'].values, dtype=float)
+
+    A_eq, b_eq, A_ub, b_ub = _linear_constraints(
+        bonds_df, target_duration, max_junk_bond_allocation,
+        max_sector_allocation, junk_bond_ratings,
+    )
 
     if objective_type == "Maximize Yield":
-        c = -1 * bonds_df['Yield'].values 
-
-        A_eq = np.array([
-            np.ones(num_bonds),
-            bonds_df['Duration'].values
-        ])
-        b_eq = np.array([1.0, target_duration])
-
-        A_ub_list = []
-        b_ub_list = []
-
-        junk_bond_indices = bonds_df['Rating'].isin(junk_bond_ratings).values
-        if np.any(junk_bond_indices):
-            junk_constraint_row = np.zeros(num_bonds)
-            junk_constraint_row[junk_bond_indices] = 1.0
-            A_ub_list.append(junk_constraint_row)
-            b_ub_list.append(max_junk_bond_allocation)
-
-        sectors = bonds_df['Sector'].unique()
-        for sector in sectors:
-            sector_indices = (bonds_df['Sector'] == sector).values
-            if np.any(sector_indices):
-                sector_constraint_row = np.zeros(num_bonds)
-                sector_constraint_row[sector_indices] = 1.0
-                A_ub_list.append(sector_constraint_row)
-                b_ub_list.append(max_sector_allocation)
-        
-        A_ub = np.array(A_ub_list) if A_ub_list else None
-        b_ub = np.array(b_ub_list) if b_ub_list else None
+        c = -yields
 
-        res = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs', A_ub=A_ub, b_ub=b_ub)
+        # HiGHS works on sparse matrices natively; the indicator rows are
+        # mostly zeros, so hand them over in CSR form. A single (lo, hi)
+        # pair is broadcast by linprog instead of validating n tuples.
+        res = linprog(
+            c,
+            A_eq=sparse.csr_matrix(A_eq), b_eq=b_eq,
+            A_ub=sparse.csr_matrix(A_ub) if A_ub is not None else None, b_ub=b_ub,
+            bounds=(0.0, max_allocation), method='highs',
+        )
 
-        if res.success:
-            weights = res.x
-        else:
+        if not res.success:
             return None, "Optimization Failed (Linear Solver): " + res.message
 
     elif objective_type == "Optimize Sharpe Ratio":
-        initial_weights = np.array([1.0 / num_bonds] * num_bonds)
-        
+        if initial_weights is None:
+            initial_weights = np.array([1.0 / num_bonds] * num_bonds)
+        bounds = [(0.0, max_allocation) for _ in range(num_bonds)]
+
+        # Same stacked A/b form the LP uses: one vector-valued equality and
+        # one vector-valued inequality, each with its constant matrix as the
+        # Jacobian, so SLSQP makes two constraint calls per iteration
+        # instead of one per sector and never finite-differences. Matrices
+        # are bound as default args (LOAD_FAST, not closure-cell lookups).
         constraints = [
-            {'type': 'eq', 'fun': lambda weights: np.sum(weights) - 1},
-            {'type': 'eq', 'fun': lambda weights: np.sum(weights * bonds_df['Duration'].values) - target_duration}
+            {'type': 'eq',
+             'fun': lambda weights, A=A_eq, b=b_eq: A @ weights - b,
+             'jac': lambda weights, A=A_eq: A},
         ]
-
-        junk_bond_indices = bonds_df['Rating'].isin(junk_bond_ratings).values
-        if np.any(junk_bond_indices):
+        if A_ub is not None:
             constraints.append({
                 'type': 'ineq',
-                'fun': lambda weights, idx=junk_bond_indices: max_junk_bond_allocation - np.sum(weights[idx])
+                'fun': lambda weights, A=A_ub, b=b_ub: b - A @ weights,
+                'jac': lambda weights, neg_A=-A_ub: neg_A,
             })
-        
-        sectors = bonds_df['Sector'].unique()
-        for sector in sectors:
-            sector_indices = (bonds_df['Sector'] == sector).values
-            if np.any(sector_indices):
-                constraints.append({
-                    'type': 'ineq',
-                    'fun': lambda weights, idx=sector_indices: max_sector_allocation - np.sum(weights[idx])
-                })
 
         res = minimize(
-            negative_sharpe_ratio, 
+            _negative_sharpe_and_gradient, 
             initial_weights, 
-            args=(bonds_df['Yield'].values, cov_matrix, risk_free_rate),
+            args=(yields, cov_matrix, risk_free_rate),
+            jac=True,
             method='SLSQP',
             bounds=bounds, 
             constraints=constraints
         )
 
-        if res.success:
-            weights = res.x
-        else:
+        if not res.success:
             return None, "Optimization Failed (Non-Linear Solver): " + res.message
     else:
         return None, "Invalid objective type selected."
 
-    if 'weights' in locals() and weights is not None:
-        bonds_df = bonds_df.copy()
-        bonds_df['Allocation %'] = (weights * 100).round(2)
-        bonds_df['Investment ($)'] = (weights * capital).round(2)
-        
-        results_df = bonds_df[bonds_df['Allocation %'] > 0.01].copy()
+    return res.x, None
+
+
+def _summarize(bonds_df, weights, capital, cov_matrix, risk_free_rate):
+    """Builds the displayed allocation frame and portfolio metrics for `weights`."""
+    yields = bonds_df['Yield'].to_numpy(dtype=float)
+    durations = bonds_df['Duration'].to_numpy(dtype=float)
+
+    allocation_pct = (weights * 100).round(2)
+    keep = allocation_pct > 0.01
+    investment = (weights[keep] * capital).round(2)
+    # Boolean indexing already yields a new frame; assign() adds the
+    # result columns to that subset without copying the whole universe.
+    results_df = bonds_df[keep].assign(**{
+        'Allocation %': allocation_pct[keep],
+        'Investment ($)': investment,
+    })
+    
+    if keep.any():
+        # Metrics come straight from the kept slices of the solver inputs;
+        # results_df is only materialized for display.
+        total_allocated_capital = investment.sum()
+        actual_weights = investment / total_allocated_capital if total_allocated_capital > 0 else np.array([])
         
-        if not results_df.empty:
-            total_allocated_capital = results_df['Investment ($)'].sum()
-            actual_weights = results_df['Investment ($)'] / total_allocated_capital if total_allocated_capital > 0 else np.array([])
-            
-            selected_cov_matrix = data_loader.generate_covariance_matrix(results_df)
+        # Same pairwise model as a rebuild from results_df, so slice it.
+        selected_cov_matrix = cov_matrix[np.ix_(keep, keep)]
 
-            portfolio_yield = portfolio_expected_return(actual_weights, results_df['Yield'])
-            portfolio_duration = portfolio_expected_return(actual_weights, results_df['Duration'])
-            portfolio_volatility_val = portfolio_volatility(actual_weights, selected_cov_matrix)
-            
-            if portfolio_volatility_val > 0:
-                sharpe_ratio_val = (portfolio_yield - risk_free_rate) / portfolio_volatility_val
-            else:
-                sharpe_ratio_val = 0
-        else:
-            portfolio_yield, portfolio_duration, portfolio_volatility_val, sharpe_ratio_val = 0, 0, 0, 0
-
-        metrics = {
-            "Portfolio Yield": float(portfolio_yield),
-            "Portfolio Duration": float(portfolio_duration),
-            "Portfolio Volatility": float(portfolio_volatility_val),
-            "Sharpe Ratio": float(sharpe_ratio_val)
-        }
+        portfolio_yield = portfolio_expected_return(actual_weights, yields[keep])
+        portfolio_duration = portfolio_expected_return(actual_weights, durations[keep])
+        portfolio_volatility_val = portfolio_volatility(actual_weights, selected_cov_matrix)
         
-        return results_df, metrics
+        if portfolio_volatility_val > 0:
+            sharpe_ratio_val = (portfolio_yield - risk_free_rate) / portfolio_volatility_val
+        else:
+            sharpe_ratio_val = 0
     else:
-        return None, "Optimization failed to produce a valid result."
+        portfolio_yield, portfolio_duration, portfolio_volatility_val, sharpe_ratio_val = 0, 0, 0, 0
+
+    metrics = {
+        "Portfolio Yield": float(portfolio_yield),
+        "Portfolio Duration": float(portfolio_duration),
+        "Portfolio Volatility": float(portfolio_volatility_val),
+        "Sharpe Ratio": float(sharpe_ratio_val)
+    }
+    
+    return results_df, metrics
+
 
 def generate_efficient_frontier(bonds_df, capital, max_alloc, max_junk, max_sector, junk_ratings, risk_free_rate):
     """
@@ -167,20 +247,28 @@ def generate_efficient_frontier(bonds_df, capital, max_alloc, max_junk, max_sect
     """
     frontier = []
     durations_to_test = np.linspace(2.0, 10.0, 10)
+    # The universe is the same for every point on the sweep.
+    cov_matrix = data_loader.generate_covariance_matrix(bonds_df)
+    warm_start = None
+    # A weighted-average duration can't leave [min, max] of the universe;
+    # SLSQP would otherwise burn its full iteration budget on such a target.
+    durations = bonds_df['Duration'].to_numpy(dtype=float)
+    min_duration, max_duration = durations.min(), durations.max()
     
     for d in durations_to_test:
-        df, metrics = run_solver(
-            bonds_df.copy(), 
-            target_duration=d, 
-            capital=capital, 
-            max_allocation=max_alloc, 
-            objective_type="Optimize Sharpe Ratio", 
-            risk_free_rate=risk_free_rate,
-            max_junk_bond_allocation=max_junk, 
-            max_sector_allocation=max_sector, 
-            junk_bond_ratings=junk_ratings
+        if not min_duration <= d <= max_duration:
+            continue
+        weights, _ = _solve_weights(
+            bonds_df, d, max_alloc, "Optimize Sharpe Ratio", risk_free_rate,
+            max_junk, max_sector, junk_ratings, cov_matrix, warm_start,
         )
-        if isinstance(metrics, dict) and metrics.get('Portfolio Yield', 0) > 0:
+        if weights is None:
+            continue
+        # Neighbouring durations have nearby optima: start the next solve
+        # from this one's raw weights instead of from equal weights.
+        warm_start = weights
+        _, metrics = _summarize(bonds_df, weights, capital, cov_matrix, risk_free_rate)
+        if metrics['Portfolio Yield'] > 0:
             frontier.append({
                 'Target Duration': float(d),
                 'Yield': metrics['Portfolio Yield'],
@@ -10,10 +10,12 @@ No web framework imports. No request/response objects. Pure functions over
 dicts so the same code runs under CPython and under Pyodide (WASM).
 """
 
+import functools
 import threading
 import time
 
 import numpy as np
+import pandas as pd
 
 import brain
 import data_loader
@@ -104,6 +106,22 @@ def _get_market_df(data_source="real"):
     return data_loader.generate_bond_market(data_source=data_source)
 
 
+def _allocation_by(column, alloc_pct):
+    """Allocation % summed per value of `column`, as sorted-key records."""
+    codes, keys = pd.factorize(column, sort=True)
+    # Missing labels factorize to -1; drop them, as groupby would.
+    has_key = codes >= 0
+    # Inputs are cent-rounded, so rounding the totals to cents recovers the
+    # exact sum and hides bincount's naive float accumulation.
+    totals = np.bincount(
+        codes[has_key], weights=np.asarray(alloc_pct)[has_key], minlength=len(keys)
+    ).round(2)
+    return [
+        {column.name: k, "Allocation %": t}
+        for k, t in zip(keys.tolist(), totals.tolist())
+    ]
+
+
 # --- Memoized solve ---
 # A single Optimize click fires optimize + monte_carlo + stress_test + backtest,
 # each re-running the identical SLSQP/linprog solve. Memoize so the 4 redundant
@@ -134,8 +152,8 @@ def _run_optimization(req_dict: dict, market_df=None):
     """
     Shared, memoized optimization. Returns (results_df, metrics).
 
-    The DataFrame is copied per caller so downstream consumers can mutate
-    their copy without corrupting the cached result.
+    The cached DataFrame itself is returned, not a copy: every endpoint here
+    only reads it. A caller that needs to mutate it must .copy() first.
     """
     key = _solve_key(req_dict)
     now = time.time()
@@ -143,14 +161,13 @@ def _run_optimization(req_dict: dict, market_df=None):
     with _solve_lock:
         hit = _solve_cache.get(key)
         if hit is not None and (now - hit["timestamp"]) < _SOLVE_TTL:
-            results_df, metrics = hit["value"]
-            return (results_df.copy() if results_df is not None else None), metrics
+            return hit["value"]
 
     if market_df is None:
         market_df = _get_market_df(req_dict.get("data_source", "real"))
 
     results_df, metrics = brain.run_solver(
-        bonds_df=market_df.copy(),
+        bonds_df=market_df,
         target_duration=req_dict["target_duration"],
         capital=req_dict["capital"],
         max_allocation=req_dict["max_allocation"],
@@ -169,7 +186,20 @@ def _run_optimization(req_dict: dict, market_df=None):
         ]:
             _solve_cache.pop(k, None)
 
-    return (results_df.copy() if results_df is not None else None), metrics
+    return results_df, metrics
+
+
+# --- Yield curve sampling ---
+# The plotted curve is a pure function of the Nelson-Siegel parameters, which
+# only change when a new treasury snapshot ships. Evaluate it once over the
+# whole grid and memoize per parameter set.
+
+_CURVE_MATURITIES = np.linspace(0.25, 30.0, 100)
+
+
+@functools.lru_cache(maxsize=8)
+def _curve_yields(ns_params: tuple) -> tuple:
+    return tuple(data_loader.nelson_siegel(_CURVE_MATURITIES, *ns_params).tolist())
 
 
 # --- Endpoint-equivalent functions ---
@@ -179,11 +209,8 @@ def yield_curve() -> dict:
     rates_data = data_loader.fetch_real_treasury_rates()
     beta0, beta1, beta2, lambda_ = rates_data["ns_params"]
 
-    maturities_plot = np.linspace(0.25, 30.0, 100).tolist()
-    curve_yields = [
-        float(data_loader.nelson_siegel(t, beta0, beta1, beta2, lambda_))
-        for t in maturities_plot
-    ]
+    maturities_plot = _CURVE_MATURITIES.tolist()
+    curve_yields = list(_curve_yields((beta0, beta1, beta2, lambda_)))
 
     return {
         "ns_params": {
@@ -231,9 +258,10 @@ def optimize(params: dict) -> dict:
             "Volatility", "Allocation %", "Investment ($)",
         ]].to_dict(orient="records")
 
-        rating_alloc = results_df.groupby("Rating")["Allocation %"].sum().reset_index().to_dict(orient="records")
-        sector_alloc = results_df.groupby("Sector")["Allocation %"].sum().reset_index().to_dict(orient="records")
-        company_alloc = results_df.groupby("Company")["Allocation %"].sum().reset_index().to_dict(orient="records")
+        alloc_pct = results_df["Allocation %"].to_numpy(dtype=float)
+        rating_alloc = _allocation_by(results_df["Rating"], alloc_pct)
+        sector_alloc = _allocation_by(results_df["Sector"], alloc_pct)
+        company_alloc = _allocation_by(results_df["Company"], alloc_pct)
 
         return {
             "success": True,
@@ -255,7 +283,7 @@ def efficient_frontier(params: dict) -> dict:
     market_df = _get_market_df(req["data_source"])
 
     frontier = brain.generate_efficient_frontier(
-        market_df.copy(),
+        market_df,
         capital=req["capital"],
         max_alloc=req["max_allocation"],
         max_junk=req["max_junk_bond_allocation"],
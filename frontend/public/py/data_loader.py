@@ -1,8 +1,8 @@
+import functools
 import json
 import logging
 import os
-import random
-import time
+import threading
 
 import numpy as np
 import pandas as pd
@@ -14,9 +14,10 @@ logger = logging.getLogger(__name__)
 
 def nelson_siegel(t, beta0, beta1, beta2, lambda_):
     """Nelson-Siegel formula for realistic yield curves."""
-    t = np.maximum(t, 1e-5)
-    term1 = (1 - np.exp(-lambda_ * t)) / (lambda_ * t)
-    term2 = term1 - np.exp(-lambda_ * t)
+    x = lambda_ * np.maximum(t, 1e-5)
+    decay = np.exp(-x)
+    term1 = (1 - decay) / x
+    term2 = term1 - decay
     return beta0 + beta1 * term1 + beta2 * term2
 
 
@@ -58,8 +59,46 @@ def fetch_real_treasury_rates():
     return _treasury_data
 
 
-# Simple time-based cache for synthetic bond market (1 hour TTL)
-_bond_market_cache = {"data": None, "timestamp": 0}
+# --- Synthetic universe tables ---
+# Static lookup arrays for _generate_synthetic_market, built once at import
+# so each draw is pure integer indexing into them.
+
+_COMPANIES = ["Apple", "Microsoft", "Tesla", "JPMorgan", "Amazon", "Google", "Goldman", "Coca-Cola", "Pfizer", "Verizon", "Exxon Mobil", "Chevron", "Walmart", "Procter & Gamble", "Johnson & Johnson", "Bank of America", "AT&T", "Ford", "General Electric", "Boeing", "Caterpillar", "Disney", "Intel", "IBM", "Oracle", "Cisco", "PepsiCo", "McDonald's", "Nike", "Home Depot", "Costco", "Salesforce", "Honeywell", "Union Pacific", "UPS", "Lowe's", "American Express", "Medtronic", "Abbott Labs", "Bristol Myers Squibb"]
+_SECTORS = {"Technology": ["Apple", "Microsoft", "Google", "Intel", "IBM", "Oracle", "Cisco", "Salesforce"],
+            "Financials": ["JPMorgan", "Goldman", "Bank of America", "American Express"],
+            "Consumer Discretionary": ["Tesla", "Amazon", "Disney", "Ford", "McDonald's", "Nike", "Home Depot", "Lowe's"],
+            "Consumer Staples": ["Coca-Cola", "Walmart", "Procter & Gamble", "Johnson & Johnson", "PepsiCo", "Costco"],
+            "Healthcare": ["Pfizer", "Medtronic", "Abbott Labs", "Bristol Myers Squibb"],
+            "Telecommunication": ["Verizon", "AT&T"],
+            "Energy": ["Exxon Mobil", "Chevron"],
+            "Industrials": ["General Electric", "Boeing", "Caterpillar", "Honeywell", "Union Pacific", "UPS"]
+           }
+_RATINGS_INFO = {
+    "AAA": {"spread": 0.005, "base_vol": 0.05},
+    "AA": {"spread": 0.008, "base_vol": 0.06},
+    "A": {"spread": 0.012, "base_vol": 0.08},
+    "BBB": {"spread": 0.020, "base_vol": 0.10},
+    "BB": {"spread": 0.040, "base_vol": 0.15},
+    "B": {"spread": 0.060, "base_vol": 0.20},
+    "CCC": {"spread": 0.090, "base_vol": 0.25},
+    "D": {"spread": 0.120, "base_vol": 0.30},
+}
+
+_COMPANY_TO_SECTOR = {comp: sector for sector, comps in _SECTORS.items() for comp in comps}
+
+_COMPANY_ARR = np.array(_COMPANIES, dtype=object)
+_SECTOR_ARR = np.array([_COMPANY_TO_SECTOR[c] for c in _COMPANIES], dtype=object)
+_ID_PREFIX_ARR = np.array([c[:3].upper() + "-" for c in _COMPANIES], dtype=object)
+_RATING_ARR = np.array(list(_RATINGS_INFO), dtype=object)
+_SPREAD_ARR = np.array([info["spread"] for info in _RATINGS_INFO.values()])
+_BASE_VOL_ARR = np.array([info["base_vol"] for info in _RATINGS_INFO.values()])
+
+
+# Process-lifetime cache for the synthetic bond market, one universe per
+# n_bonds. Generation is fully determined by the fixed seed and the static
+# treasury snapshot, so a cached universe never goes stale and there is
+# nothing to expire or persist.
+_bond_market_lock = threading.Lock()
 
 
 def generate_bond_market(n_bonds=150, data_source="synthetic"):
@@ -73,74 +112,53 @@ def generate_bond_market(n_bonds=150, data_source="synthetic"):
     if data_source == "real":
         return real_data_loader.load_real_bonds()
 
-    global _bond_market_cache
-    now = time.time()
-    if _bond_market_cache["data"] is not None and (now - _bond_market_cache["timestamp"]) < 3600:
-        return _bond_market_cache["data"]
+    # Generate under the lock so concurrent first callers (FastAPI's
+    # threadpool in the oracle) build the universe once, not once each.
+    with _bond_market_lock:
+        return _synthetic_market(n_bonds)
+
 
-    # Fixed seed for reproducibility
-    random.seed(42)
-    np.random.seed(42)
+@functools.lru_cache(maxsize=16)
+def _synthetic_market(n_bonds):
+    """Memoized _generate_synthetic_market; callers must not mutate the frame."""
+    return _generate_synthetic_market(n_bonds)
+
+
+def _generate_synthetic_market(n_bonds):
+    """Builds the seeded synthetic universe (uncached)."""
+    # Fixed seed for reproducibility. A local Generator keeps the draw
+    # independent of (and from clobbering) the global random state.
+    rng = np.random.default_rng(42)
 
     rates_data = fetch_real_treasury_rates()
     beta0, beta1, beta2, lambda_ = rates_data["ns_params"]
 
-    bond_data = []
-    companies = ["Apple", "Microsoft", "Tesla", "JPMorgan", "Amazon", "Google", "Goldman", "Coca-Cola", "Pfizer", "Verizon", "Exxon Mobil", "Chevron", "Walmart", "Procter & Gamble", "Johnson & Johnson", "Bank of America", "AT&T", "Ford", "General Electric", "Boeing", "Caterpillar", "Disney", "Intel", "IBM", "Oracle", "Cisco", "PepsiCo", "McDonald's", "Nike", "Home Depot", "Costco", "Salesforce", "Honeywell", "Union Pacific", "UPS", "Lowe's", "American Express", "Medtronic", "Abbott Labs", "Bristol Myers Squibb"]
-    sectors = {"Technology": ["Apple", "Microsoft", "Google", "Intel", "IBM", "Oracle", "Cisco", "Salesforce"],
-               "Financials": ["JPMorgan", "Goldman", "Bank of America", "American Express"],
-               "Consumer Discretionary": ["Tesla", "Amazon", "Disney", "Ford", "McDonald's", "Nike", "Home Depot", "Lowe's"],
-               "Consumer Staples": ["Coca-Cola", "Walmart", "Procter & Gamble", "Johnson & Johnson", "PepsiCo", "Costco"],
-               "Healthcare": ["Pfizer", "Medtronic", "Abbott Labs", "Bristol Myers Squibb"],
-               "Telecommunication": ["Verizon", "AT&T"],
-               "Energy": ["Exxon Mobil", "Chevron"],
-               "Industrials": ["General Electric", "Boeing", "Caterpillar", "Honeywell", "Union Pacific", "UPS"]
-              }
-
-    company_to_sector = {comp: sector for sector, comps in sectors.items() for comp in comps}
-
-    ratings_info = {
-        "AAA": {"spread": 0.005, "base_vol": 0.05},
-        "AA": {"spread": 0.008, "base_vol": 0.06},
-        "A": {"spread": 0.012, "base_vol": 0.08},
-        "BBB": {"spread": 0.020, "base_vol": 0.10},
-        "BB": {"spread": 0.040, "base_vol": 0.15},
-        "B": {"spread": 0.060, "base_vol": 0.20},
-        "CCC": {"spread": 0.090, "base_vol": 0.25},
-        "D": {"spread": 0.120, "base_vol": 0.30},
-    }
-
-    for i in range(n_bonds):
-        company = random.choice(companies)
-        sector = company_to_sector[company]
-        rating = random.choice(list(ratings_info.keys()))
-        duration = round(random.uniform(1.0, 15.0), 1)
-
-        spread = ratings_info[rating]["spread"]
-        base_yield_at_duration = nelson_siegel(duration, beta0, beta1, beta2, lambda_)
-
-        yield_val = base_yield_at_duration + spread + random.uniform(-0.005, 0.005)
-        price = 100 / ((1 + yield_val) ** duration)
-
-        base_vol = ratings_info[rating]["base_vol"]
-        volatility = round(base_vol + (duration / 15.0) * 0.05 + random.uniform(-0.01, 0.01), 4)
-        if volatility < 0.01:
-            volatility = 0.01
-
-        bond_data.append({
-            "Bond_ID": f"{company[:3].upper()}-{random.randint(1000,9999)}",
-            "Company": company,
-            "Sector": sector,
-            "Rating": rating,
-            "Duration": duration,
-            "Yield": round(yield_val, 4),
-            "Volatility": volatility,
-            "Price": round(price * 100, 2)
-        })
-
-    df = pd.DataFrame(bond_data)
-    _bond_market_cache["data"] = df
-    _bond_market_cache["timestamp"] = now
+    # Draw every bond at once and build each column as an array expression.
+    company_idx = rng.integers(0, len(_COMPANY_ARR), n_bonds)
+    rating_idx = rng.integers(0, len(_RATING_ARR), n_bonds)
+    durations = np.round(rng.uniform(1.0, 15.0, n_bonds), 1)
+    yield_noise = rng.uniform(-0.005, 0.005, n_bonds)
+    vol_noise = rng.uniform(-0.01, 0.01, n_bonds)
+    id_suffix = rng.integers(1000, 10000, n_bonds)
+
+    base_yields = nelson_siegel(durations, beta0, beta1, beta2, lambda_)
+    yields = base_yields + _SPREAD_ARR[rating_idx] + yield_noise
+    prices = 100 / ((1 + yields) ** durations)
+    volatility = np.maximum(
+        np.round(_BASE_VOL_ARR[rating_idx] + (durations / 15.0) * 0.05 + vol_noise, 4),
+        0.01,
+    )
+
+    df = pd.DataFrame({
+        "Bond_ID": _ID_PREFIX_ARR[company_idx] + id_suffix.astype(str).astype(object),
+        "Company": _COMPANY_ARR[company_idx],
+        "Sector": _SECTOR_ARR[company_idx],
+        "Rating": _RATING_ARR[rating_idx],
+        "Duration": durations,
+        "Yield": np.round(yields, 4),
+        "Volatility": volatility,
+        "Price": np.round(prices * 100, 2),
+    })
     return df
 
 
@@ -148,28 +166,42 @@ def generate_covariance_matrix(bonds_df):
     """
     Constructs a covariance matrix with correlations based on
     sector and credit tier similarity.
+
+    The matrix depends only on each bond's volatility, sector and rating, so
+    it is memoized on those columns: the efficient-frontier sweep and the
+    risk endpoints re-request the same universe many times. The returned
+    array is shared between callers and therefore read-only.
     """
-    n = len(bonds_df)
-    vols = bonds_df['Volatility'].values
-    sectors = bonds_df['Sector'].values
-    ratings = bonds_df['Rating'].values
+    return _covariance_for(
+        tuple(bonds_df['Volatility'].tolist()),
+        tuple(bonds_df['Sector'].tolist()),
+        tuple(bonds_df['Rating'].tolist()),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _covariance_for(vols, sectors, ratings):
+    """Builds the (read-only) covariance matrix from hashable column tuples."""
+    n = len(vols)
+    vols = np.array(vols, dtype=float)
+    sectors = np.array(sectors, dtype=object)
+    ratings = np.array(ratings, dtype=object)
 
     # Vectorized correlation build: 0.25 base, +0.3 same-sector,
     # +0.15 same-IG-status, off-diagonals clamped at 0.90, unit diagonal.
-    ig_ratings = {"AAA", "AA", "A", "BBB"}
+    ig_ratings = ["AAA", "AA", "A", "BBB"]
     same_sector = sectors[:, None] == sectors[None, :]
-    is_ig = np.array([r in ig_ratings for r in ratings])
+    is_ig = np.isin(ratings, ig_ratings)
     same_ig = is_ig[:, None] == is_ig[None, :]
 
-    C = np.full((n, n), 0.25)
-    C += np.where(same_sector, 0.30, 0.0)
-    C += np.where(same_ig, 0.15, 0.0)
-    np.clip(C, None, 0.90, out=C)
+    C = 0.25 + 0.30 * same_sector + 0.15 * same_ig
+    np.minimum(C, 0.90, out=C)
     np.fill_diagonal(C, 1.0)
 
-    diag_vols = np.diag(vols)
-    cov_matrix = diag_vols @ C @ diag_vols
-    cov_matrix += np.eye(n) * 1e-8
+    # Outer product of vols == diag(σ) C diag(σ) without two n×n matmuls.
+    cov_matrix = np.outer(vols, vols) * C
+    cov_matrix[np.diag_indices(n)] += 1e-8
+    cov_matrix.flags.writeable = False
 
     return cov_matrix
 
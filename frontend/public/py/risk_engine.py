@@ -3,6 +3,10 @@ risk_engine.py
 Advanced risk analytics: Monte Carlo simulation, stress testing, and backtesting.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional
@@ -13,6 +17,49 @@ import data_loader
 # 1. MONTE CARLO SIMULATION — VaR & CVaR
 # ===========================================================================
 
+# Unseeded PCG64 generator shared by every Monte Carlo call: fresh draws each
+# run, without the legacy global MT19937 state. Generator methods hold the
+# bit generator's lock, so concurrent oracle requests stay safe.
+_mc_rng = np.random.default_rng()
+
+# Small LRU of Cholesky factors keyed by a digest of the covariance bytes:
+# re-running the backtest for the same portfolio (different capital, horizon
+# or period type) reuses the factor instead of refactorizing.
+_CHOLESKY_CACHE_SIZE = 16
+_cholesky_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_cholesky_lock = threading.Lock()
+
+
+def _cholesky_factor(cov_matrix: np.ndarray) -> np.ndarray:
+    """Factor L with L @ L.T = cov + 1e-8·I (read-only, memoized).
+
+    Lower Cholesky of the jittered matrix when it is positive definite.
+    Otherwise V·diag(√λ) from the eigendecomposition of cov with negative
+    eigenvalues clipped to zero, so L @ L.T is the clipped (un-jittered)
+    PSD matrix and the correlations survive.
+    """
+    cov_matrix = np.ascontiguousarray(cov_matrix, dtype=np.float64)
+    key = (cov_matrix.shape, hashlib.blake2b(cov_matrix.tobytes(), digest_size=16).digest())
+    with _cholesky_lock:
+        L = _cholesky_cache.get(key)
+        if L is not None:
+            _cholesky_cache.move_to_end(key)
+            return L
+
+    try:
+        L = np.linalg.cholesky(cov_matrix + np.eye(len(cov_matrix)) * 1e-8)
+    except np.linalg.LinAlgError:
+        eigvals, eigvecs = np.linalg.eigh(cov_matrix)
+        L = eigvecs * np.sqrt(np.clip(eigvals, 0.0, None))
+    L.flags.writeable = False
+
+    with _cholesky_lock:
+        _cholesky_cache[key] = L
+        if len(_cholesky_cache) > _CHOLESKY_CACHE_SIZE:
+            _cholesky_cache.popitem(last=False)
+    return L
+
+
 def run_monte_carlo(
     weights: np.ndarray,
     expected_returns: np.ndarray,
@@ -25,8 +72,8 @@ def run_monte_carlo(
     """
     Runs Monte Carlo simulation to estimate portfolio risk metrics.
     
-    Uses Cholesky decomposition of the covariance matrix to generate
-    correlated random returns, then computes VaR and CVaR.
+    Draws one normal portfolio-level log-return per path, with the
+    portfolio's volatility sqrt(w'Cw), then computes VaR and CVaR.
     
     Parameters:
         weights: Portfolio weights (must sum to 1)
@@ -43,27 +90,17 @@ def run_monte_carlo(
     if confidence_levels is None:
         confidence_levels = [0.90, 0.95, 0.99]
     
-    n_assets = len(weights)
     dt = time_horizon_days / 252.0
     
     # Annualized portfolio return and volatility
     port_return = np.sum(weights * expected_returns)
     port_vol = np.sqrt(weights.T @ cov_matrix @ weights)
     
-    # Generate correlated random returns using Cholesky decomposition
-    try:
-        L = np.linalg.cholesky(cov_matrix + np.eye(n_assets) * 1e-8)
-    except np.linalg.LinAlgError:
-        # Fallback: use diagonal if Cholesky fails
-        L = np.diag(np.sqrt(np.diag(cov_matrix)))
-    
-    # Simulate portfolio returns (GBM: geometric Brownian motion)
-    Z = np.random.standard_normal((n_simulations, n_assets))
-    correlated_returns = Z @ L.T
-    correlated_returns = np.clip(correlated_returns, -10, 10)  # Prevent overflow
-    
-    # Portfolio-level returns for each simulation
-    daily_port_returns = correlated_returns @ weights
+    # Only the portfolio-level shock matters, and a weighted sum of
+    # correlated normal asset returns is itself normal with std port_vol.
+    # So draw that one normal per simulation directly: no per-asset returns,
+    # no factorization of the covariance matrix.
+    daily_port_returns = port_vol * _mc_rng.standard_normal(n_simulations)
     
     # Scale to time horizon
     portfolio_returns = daily_port_returns * np.sqrt(dt) + (port_return - 0.5 * port_vol**2) * dt
@@ -72,18 +109,21 @@ def run_monte_carlo(
     terminal_values = capital * np.exp(portfolio_returns)
     pnl = terminal_values - capital
     
-    # Sort for quantile computation
-    sorted_pnl = np.sort(pnl)
-    sorted_returns = np.sort(portfolio_returns)
+    # VaR/CVaR only need the lower tail: one multi-kth partition places each
+    # VaR order statistic exactly and leaves everything below it in front.
+    # pnl is monotone in the return (capital * expm1(r)), so the return tail
+    # is recovered from the pnl tail via log1p instead of a second partition.
+    var_idx = [int((1 - cl) * n_simulations) for cl in confidence_levels]
+    pnl_tail = np.partition(pnl, var_idx)
+    returns_tail = np.log1p(pnl_tail[:max(var_idx) + 1] / capital)
     
     # Compute VaR and CVaR at each confidence level
     var_results = {}
-    for cl in confidence_levels:
-        idx = int((1 - cl) * n_simulations)
-        var_dollar = -sorted_pnl[idx]
-        cvar_dollar = -np.mean(sorted_pnl[:idx]) if idx > 0 else var_dollar
-        var_pct = -sorted_returns[idx]
-        cvar_pct = -np.mean(sorted_returns[:idx]) if idx > 0 else var_pct
+    for cl, idx in zip(confidence_levels, var_idx):
+        var_dollar = -pnl_tail[idx]
+        cvar_dollar = -np.mean(pnl_tail[:idx]) if idx > 0 else var_dollar
+        var_pct = -returns_tail[idx]
+        cvar_pct = -np.mean(returns_tail[:idx]) if idx > 0 else var_pct
         
         var_results[f"{int(cl*100)}%"] = {
             "VaR_dollar": round(float(var_dollar), 2),
@@ -92,17 +132,35 @@ def run_monte_carlo(
             "CVaR_percent": round(float(cvar_pct * 100), 2),
         }
     
-    # Build histogram data for frontend
+    # All reported percentiles in a single selection pass.
+    pct_levels = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+    pct_values = np.percentile(pnl, pct_levels)
+    percentiles = dict(zip([f"p{q}" for q in pct_levels], pct_values.round(2).tolist()))
+    
+    # Summary statistics rounded and converted in one go.
+    mean_pnl, std_pnl, min_pnl, max_pnl, prob_loss = np.array([
+        np.mean(pnl), np.std(pnl), np.min(pnl), np.max(pnl), np.mean(pnl < 0) * 100,
+    ]).round(2).tolist()
+    
+    # Build histogram data for frontend: round whole columns, convert each
+    # with one tolist(), then zip into records.
     hist_counts, hist_edges = np.histogram(pnl, bins=50)
+    hist_mids = (hist_edges[:-1] + hist_edges[1:]) * 0.5
     histogram = [
         {
-            "bin_start": round(float(hist_edges[i]), 2),
-            "bin_end": round(float(hist_edges[i+1]), 2),
-            "bin_mid": round(float((hist_edges[i] + hist_edges[i+1]) / 2), 2),
-            "count": int(hist_counts[i]),
-            "frequency": round(float(hist_counts[i]) / n_simulations, 4),
+            "bin_start": bin_start,
+            "bin_end": bin_end,
+            "bin_mid": bin_mid,
+            "count": count,
+            "frequency": frequency,
         }
-        for i in range(len(hist_counts))
+        for bin_start, bin_end, bin_mid, count, frequency in zip(
+            hist_edges[:-1].round(2).tolist(),
+            hist_edges[1:].round(2).tolist(),
+            hist_mids.round(2).tolist(),
+            hist_counts.tolist(),
+            (hist_counts / n_simulations).round(4).tolist(),
+        )
     ]
     
     return {
@@ -111,25 +169,15 @@ def run_monte_carlo(
         "capital": capital,
         "expected_return_annual": round(float(port_return * 100), 2),
         "expected_volatility_annual": round(float(port_vol * 100), 2),
-        "mean_pnl": round(float(np.mean(pnl)), 2),
-        "median_pnl": round(float(np.median(pnl)), 2),
-        "std_pnl": round(float(np.std(pnl)), 2),
-        "min_pnl": round(float(np.min(pnl)), 2),
-        "max_pnl": round(float(np.max(pnl)), 2),
-        "prob_loss": round(float(np.mean(pnl < 0) * 100), 2),
+        "mean_pnl": mean_pnl,
+        "median_pnl": percentiles["p50"],
+        "std_pnl": std_pnl,
+        "min_pnl": min_pnl,
+        "max_pnl": max_pnl,
+        "prob_loss": prob_loss,
         "var_cvar": var_results,
         "histogram": histogram,
-        "percentiles": {
-            "p1": round(float(np.percentile(pnl, 1)), 2),
-            "p5": round(float(np.percentile(pnl, 5)), 2),
-            "p10": round(float(np.percentile(pnl, 10)), 2),
-            "p25": round(float(np.percentile(pnl, 25)), 2),
-            "p50": round(float(np.percentile(pnl, 50)), 2),
-            "p75": round(float(np.percentile(pnl, 75)), 2),
-            "p90": round(float(np.percentile(pnl, 90)), 2),
-            "p95": round(float(np.percentile(pnl, 95)), 2),
-            "p99": round(float(np.percentile(pnl, 99)), 2),
-        },
+        "percentiles": percentiles,
     }
 
 
@@ -192,15 +240,75 @@ STRESS_SCENARIOS = {
 
 IG_RATINGS = {"AAA", "AA+", "AA", "AA-", "A+", "A", "A-", "BBB+", "BBB", "BBB-"}
 
-def _get_credit_spread(rating: str) -> float:
-    """Returns approximate credit spread for a rating."""
-    spreads = {
-        "AAA": 0.005, "AA+": 0.006, "AA": 0.007, "AA-": 0.008,
-        "A+": 0.009, "A": 0.010, "A-": 0.012,
-        "BBB+": 0.014, "BBB": 0.017, "BBB-": 0.020,
-        "BB": 0.035, "B": 0.050, "CCC": 0.085, "D": 0.120,
-    }
-    return spreads.get(rating, 0.015)
+# Rating lookup tables indexed by integer rating code. Unknown ratings map
+# to code -1, which lands on the trailing default entry of each table.
+RATING_ORDER = ["AAA", "AA+", "AA", "AA-", "A+", "A", "A-",
+                "BBB+", "BBB", "BBB-", "BB", "B", "CCC", "D"]
+RATING_TO_CODE = {r: i for i, r in enumerate(RATING_ORDER)}
+SPREAD_LUT = np.array([
+    0.005, 0.006, 0.007, 0.008, 0.009, 0.010, 0.012,
+    0.014, 0.017, 0.020, 0.035, 0.050, 0.085, 0.120,
+    0.015,  # default for unknown ratings
+], dtype=np.float64)
+IG_MASK = np.array([r in IG_RATINGS for r in RATING_ORDER] + [False])
+
+
+def _rating_codes(ratings: pd.Series) -> np.ndarray:
+    """Encodes ratings as int8 codes into the lookup tables (-1 if unknown)."""
+    if isinstance(ratings.dtype, pd.CategoricalDtype):
+        # Map each category once, then gather by the column's own codes
+        # (whose -1 for missing lands on the appended -1).
+        by_category = pd.Series(ratings.cat.categories).map(RATING_TO_CODE).fillna(-1)
+        lut = np.append(by_category.to_numpy(np.int8), np.int8(-1))
+        return lut[ratings.cat.codes.to_numpy()]
+    return ratings.map(RATING_TO_CODE).fillna(-1).to_numpy(np.int8)
+
+
+def _scenario_params(scenario: dict) -> tuple:
+    """(yield_shift, IG spread mult, HY spread mult, vol mult) for a scenario."""
+    spread_mult = scenario.get("spread_multiplier", 1.0)
+    return (
+        scenario["yield_shift"],
+        spread_mult,
+        # For flight-to-quality, HY and IG have different multipliers.
+        scenario.get("hy_spread_multiplier", spread_mult),
+        scenario.get("volatility_multiplier", 1.0),
+    )
+
+
+def _stress_kernel(yields, durations, weights, base_spreads, is_ig,
+                   yield_shifts, ig_mults, hy_mults):
+    """
+    Applies K scenarios' shocks to the per-bond arrays as one K×N grid.
+    Scenario parameters are length-K arrays; returns length-K arrays of
+    (stressed_yield, weighted_yield_change, price_impact_pct).
+    """
+    spread_mult = np.where(is_ig[None, :], ig_mults[:, None], hy_mults[:, None])
+    spread_change = base_spreads * spread_mult - base_spreads
+    stressed_yields = np.maximum(yields + yield_shifts[:, None] + spread_change, 0.001)
+    
+    # Per-bond price impact using modified duration: ΔP_i/P_i ≈ -D_i × Δy_i
+    # Portfolio impact = Σ w_i · (ΔP_i / P_i). Using -D_portfolio × Δy_weighted
+    # would be exact only if D_i and Δy_i are uncorrelated across bonds —
+    # which fails for non-parallel shifts (e.g., flight-to-quality).
+    # Both portfolio-level outputs are linear in the yield changes, so stack
+    # their per-bond sensitivities (weights, -D_i·w_i) and reduce every
+    # scenario against both with a single K×N @ N×2 matmul.
+    yield_changes = stressed_yields - yields
+    sensitivities = np.column_stack([weights, -durations * weights])
+    weighted_yield_change, price_impact_pct = (yield_changes @ sensitivities).T
+    stressed_yield = stressed_yields @ weights
+    return stressed_yield, weighted_yield_change, price_impact_pct
+
+
+# STRESS_SCENARIOS flattened once at import into a structured table (one row
+# per scenario, defaults already applied) plus a key -> row index.
+_SCENARIO_KEYS = list(STRESS_SCENARIOS)
+_SCENARIO_INDEX = {k: i for i, k in enumerate(_SCENARIO_KEYS)}
+_SCENARIO_TBL = np.array(
+    [_scenario_params(STRESS_SCENARIOS[k]) for k in _SCENARIO_KEYS],
+    dtype=[("shift", "f8"), ("sm", "f8"), ("hy", "f8"), ("vm", "f8")],
+)
 
 
 def run_stress_test(
@@ -228,8 +336,12 @@ def run_stress_test(
     if scenarios is None:
         scenarios = list(STRESS_SCENARIOS.keys())
     
-    base_yield = float(np.sum(weights * portfolio_df['Yield'].values))
-    base_duration = float(np.sum(weights * portfolio_df['Duration'].values))
+    # Pull the numeric columns out of pandas once; everything below is numpy.
+    yields = portfolio_df['Yield'].to_numpy()
+    durations = portfolio_df['Duration'].to_numpy()
+
+    base_yield = float(np.sum(weights * yields))
+    base_duration = float(np.sum(weights * durations))
     
     cov_matrix = data_loader.generate_covariance_matrix(portfolio_df)
     base_vol = float(np.sqrt(weights.T @ cov_matrix @ weights))
@@ -239,49 +351,31 @@ def run_stress_test(
     else:
         base_sharpe = 0.0
     
+    # Per-bond inputs that don't depend on the scenario, built once.
+    codes = _rating_codes(portfolio_df['Rating'])
+    base_spreads = SPREAD_LUT[codes]
+    is_ig = IG_MASK[codes]
+    
+    keys = [k for k in scenarios if k in _SCENARIO_INDEX]
+    table = _SCENARIO_TBL[[_SCENARIO_INDEX[k] for k in keys]]
+    stressed_yields, weighted_yield_changes, price_impacts = _stress_kernel(
+        yields, durations, weights, base_spreads, is_ig,
+        table["shift"], table["sm"], table["hy"],
+    )
+    vol_mults = table["vm"].tolist()
+    
     results = []
     
-    for scenario_key in scenarios:
-        if scenario_key not in STRESS_SCENARIOS:
-            continue
-        
+    for k, scenario_key in enumerate(keys):
         scenario = STRESS_SCENARIOS[scenario_key]
-        
-        # Apply yield shocks
-        stressed_yields = portfolio_df['Yield'].values.copy()
-        
-        for i, rating in enumerate(portfolio_df['Rating'].values):
-            base_spread = _get_credit_spread(rating)
-            yield_shift = scenario["yield_shift"]
-            
-            # Apply spread multiplier
-            is_ig = rating in IG_RATINGS
-            spread_mult = scenario.get("spread_multiplier", 1.0)
-            
-            # For flight-to-quality, HY and IG have different multipliers
-            if "hy_spread_multiplier" in scenario and not is_ig:
-                spread_mult = scenario["hy_spread_multiplier"]
-            
-            new_spread = base_spread * spread_mult
-            spread_change = new_spread - base_spread
-            
-            stressed_yields[i] = max(stressed_yields[i] + yield_shift + spread_change, 0.001)
-        
-        # Per-bond price impact using modified duration: ΔP_i/P_i ≈ -D_i × Δy_i
-        # Portfolio impact = Σ w_i · (ΔP_i / P_i). Using -D_portfolio × Δy_weighted
-        # would be exact only if D_i and Δy_i are uncorrelated across bonds —
-        # which fails for non-parallel shifts (e.g., flight-to-quality).
-        durations = portfolio_df['Duration'].values
-        yield_changes = stressed_yields - portfolio_df['Yield'].values
-        weighted_yield_change = float(np.sum(weights * yield_changes))
-        price_impact_pct = float(np.sum(weights * (-durations * yield_changes)))
+        stressed_yield = float(stressed_yields[k])
+        weighted_yield_change = float(weighted_yield_changes[k])
+        price_impact_pct = float(price_impacts[k])
         pnl_dollar = capital * price_impact_pct
         
         # Stressed volatility
-        vol_mult = scenario.get("volatility_multiplier", 1.0)
-        stressed_vol = base_vol * vol_mult
+        stressed_vol = base_vol * vol_mults[k]
         
-        stressed_yield = float(np.sum(weights * stressed_yields))
         if stressed_vol > 0:
             stressed_sharpe = (stressed_yield - risk_free_rate) / stressed_vol
         else:
@@ -318,6 +412,30 @@ def run_stress_test(
 # 3. BACKTESTING ENGINE — Historical Simulation
 # ===========================================================================
 
+def _max_drawdown(values) -> float:
+    """Largest peak-to-trough decline of a value path, as a fraction of the peak."""
+    values = np.asarray(values, dtype=np.float64)
+    peaks = np.maximum.accumulate(values)
+    return float(max(np.max((peaks - values) / peaks), 0.0))
+
+
+def _realized_sharpe(returns: np.ndarray, ann_factor: int, risk_free_rate: float) -> float:
+    """Annualized Sharpe of per-period returns; 0 when there is no dispersion."""
+    n = returns.size
+    if n == 0:
+        return 0.0
+    # Population variance on centered data (sum-of-squares minus mean² would
+    # cancel catastrophically when the dispersion is small next to the mean).
+    mu = returns.sum() / n
+    d = returns - mu
+    var = d @ d / n
+    # Dispersion at the rounding noise of the mean (e.g. constant returns,
+    # where mu itself is off by an ulp) is no dispersion.
+    if var <= (np.finfo(np.float64).eps * mu) ** 2:
+        return 0.0
+    return float((mu * ann_factor - risk_free_rate) / np.sqrt(var * ann_factor))
+
+
 def run_backtest(
     portfolio_df: pd.DataFrame,
     weights: np.ndarray,
@@ -345,12 +463,12 @@ def run_backtest(
         Dictionary with time series data for chart rendering
     """
     # Local RNG so backtest reproducibility doesn't leak into other endpoints
-    # (Monte Carlo intentionally uses fresh np.random draws each call).
+    # (Monte Carlo intentionally uses fresh draws from _mc_rng each call).
     rng = np.random.default_rng(42)
 
     n_assets = len(portfolio_df)
     cov_matrix = data_loader.generate_covariance_matrix(portfolio_df)
-    expected_returns = portfolio_df['Yield'].values
+    expected_returns = portfolio_df['Yield'].to_numpy()
     
     # Time scaling
     if period_type == "monthly":
@@ -362,90 +480,64 @@ def run_backtest(
     
     # Portfolio parameters
     port_return = float(np.sum(weights * expected_returns))
-    port_vol = float(np.sqrt(weights.T @ cov_matrix @ weights))
+    port_vol = float(np.sqrt(np.einsum('i,ij,j->', weights, cov_matrix, weights, optimize=True)))
     
-    # Equal-weight benchmark
-    eq_weights = np.ones(n_assets) / n_assets
-    eq_return = float(np.sum(eq_weights * expected_returns))
-    eq_vol = float(np.sqrt(eq_weights.T @ cov_matrix @ eq_weights))
+    # Equal-weight benchmark, in closed form (no weight vector needed)
+    eq_return = float(expected_returns.mean())
+    # (1/n)·1ᵀ C (1/n)·1 = sum(C) / n², so no matrix-vector product needed.
+    eq_vol = float(np.sqrt(cov_matrix.sum())) / n_assets
     
     # Simulate paths with correlated shocks
-    try:
-        L = np.linalg.cholesky(cov_matrix + np.eye(n_assets) * 1e-8)
-    except np.linalg.LinAlgError:
-        L = np.diag(np.sqrt(np.diag(cov_matrix)))
+    L = _cholesky_factor(cov_matrix)
     
     # Generate common random shocks (same market conditions for fair comparison)
     Z = rng.standard_normal((n_periods, n_assets))
-    correlated_shocks = Z @ L.T
-    
-    # Build cumulative return series
-    opt_values = [capital]
-    eq_values = [capital]
-    rf_values = [capital]
-    
-    opt_cum_return = 0.0
-    eq_cum_return = 0.0
-    
-    period_returns_opt = []
-    period_returns_eq = []
     
+    # Period returns for every step at once. Each row of Z @ L.T has
+    # covariance = Cov (annualized), so its weighted sum is a portfolio-level
+    # shock with std = port_vol; scaling by sqrt(dt) gives the period shock.
+    # Only those weighted sums are needed, so project the weights through
+    # L.T once and take one gemv per portfolio instead of building Z @ L.T.
+    # For equal weights, L.T @ (1/n) is just L's column means.
     sqrt_dt = np.sqrt(dt)
-    for t in range(n_periods):
-        # Period returns for each asset. correlated_shocks[t] already has
-        # covariance = Cov (annualized), so the weighted sum is a portfolio-level
-        # shock with std = port_vol. Scaling by sqrt(dt) gives the period shock.
-        asset_shocks = correlated_shocks[t]
-
-        opt_period_return = port_return * dt + sqrt_dt * float(np.sum(weights * asset_shocks))
-        opt_values.append(opt_values[-1] * (1 + opt_period_return))
-        period_returns_opt.append(opt_period_return)
-
-        eq_period_return = eq_return * dt + sqrt_dt * float(np.sum(eq_weights * asset_shocks))
-        eq_values.append(eq_values[-1] * (1 + eq_period_return))
-        period_returns_eq.append(eq_period_return)
-        
-        # Risk-free return
-        rf_values.append(rf_values[-1] * (1 + risk_free_rate * dt))
-    
-    # Build time series for frontend
-    time_series = []
-    for i in range(n_periods + 1):
-        time_series.append({
-            "period": period_labels[i],
+    period_returns_opt = port_return * dt + sqrt_dt * (Z @ (L.T @ weights))
+    period_returns_eq = eq_return * dt + sqrt_dt * (Z @ (L.sum(axis=0) / n_assets))
+    
+    # Value paths compound left to right from capital, exactly as a running
+    # product would: one growth-factor matrix (optimized, equal-weight,
+    # risk-free), one cumprod along time.
+    growth = np.empty((3, n_periods + 1))
+    growth[:, 0] = capital
+    growth[0, 1:] = 1 + period_returns_opt
+    growth[1, 1:] = 1 + period_returns_eq
+    growth[2, 1:] = 1 + risk_free_rate * dt
+    paths = np.cumprod(growth, axis=1)
+    opt_values, eq_values, rf_values = paths.tolist()
+    
+    # Build time series for frontend: all three paths rounded in one call.
+    opt_rounded, eq_rounded, rf_rounded = np.round(paths, 2).tolist()
+    time_series = [
+        {
+            "period": label,
             "period_num": i,
-            "optimized": round(opt_values[i], 2),
-            "equal_weight": round(eq_values[i], 2),
-            "risk_free": round(rf_values[i], 2),
-        })
+            "optimized": opt,
+            "equal_weight": eq,
+            "risk_free": rf,
+        }
+        for i, (label, opt, eq, rf) in enumerate(
+            zip(period_labels, opt_rounded, eq_rounded, rf_rounded)
+        )
+    ]
     
     # Summary statistics
     total_return_opt = (opt_values[-1] - capital) / capital
     total_return_eq = (eq_values[-1] - capital) / capital
     total_return_rf = (rf_values[-1] - capital) / capital
     
-    # Compute max drawdown
-    def max_drawdown(values):
-        peak = values[0]
-        mdd = 0
-        for v in values:
-            if v > peak:
-                peak = v
-            dd = (peak - v) / peak
-            if dd > mdd:
-                mdd = dd
-        return mdd
-    
     # Annualized Sharpe of realized returns
-    if period_returns_opt:
-        ann_factor = 12 if period_type == "monthly" else 4
-        opt_sharpe = (np.mean(period_returns_opt) * ann_factor - risk_free_rate) / \
-                     (np.std(period_returns_opt) * np.sqrt(ann_factor)) if np.std(period_returns_opt) > 0 else 0
-        eq_sharpe = (np.mean(period_returns_eq) * ann_factor - risk_free_rate) / \
-                    (np.std(period_returns_eq) * np.sqrt(ann_factor)) if np.std(period_returns_eq) > 0 else 0
-    else:
-        opt_sharpe = 0
-        eq_sharpe = 0
+    ann_factor = 12 if period_type == "monthly" else 4
+    opt_sharpe = _realized_sharpe(period_returns_opt, ann_factor, risk_free_rate)
+    eq_sharpe = _realized_sharpe(period_returns_eq, ann_factor, risk_free_rate)
     
     return {
         "time_series": time_series,
@@ -455,16 +547,16 @@ def run_backtest(
             "optimized": {
                 "total_return_pct": round(total_return_opt * 100, 2),
                 "final_value": round(opt_values[-1], 2),
-                "max_drawdown_pct": round(max_drawdown(opt_values) * 100, 2),
-                "sharpe_ratio": round(float(opt_sharpe), 3),
+                "max_drawdown_pct": round(_max_drawdown(opt_values) * 100, 2),
+                "sharpe_ratio": round(opt_sharpe, 3),
                 "portfolio_yield": round(port_return * 100, 2),
                 "portfolio_volatility": round(port_vol * 100, 2),
             },
             "equal_weight": {
                 "total_return_pct": round(total_return_eq * 100, 2),
                 "final_value": round(eq_values[-1], 2),
-                "max_drawdown_pct": round(max_drawdown(eq_values) * 100, 2),
-                "sharpe_ratio": round(float(eq_sharpe), 3),
+                "max_drawdown_pct": round(_max_drawdown(eq_values) * 100, 2),
+                "sharpe_ratio": round(eq_sharpe, 3),
                 "portfolio_yield": round(eq_return * 100, 2),
                 "portfolio_volatility": round(eq_vol * 100, 2),
             },
@@ -191,9 +191,9 @@ const phases: Phase[] = [
                 term: "Cholesky Decomposition",
                 category: "Math",
                 oneLiner: "A math technique that makes simulated random scenarios respect real-world correlations.",
-                explanation: "When running Monte Carlo, we generate random numbers for each bond's future performance. But we can't just roll a separate dice for each bond independently — because Exxon and Chevron always crash together (they're both oil). If the simulation randomly shows Exxon crashing but Chevron thriving, it's producing garbage. Cholesky decomposition takes the covariance matrix and uses it to 'link' the random numbers together so correlated bonds always move in sync, just like in real life.",
-                example: "The simulation randomly generates a bad month for oil. Thanks to Cholesky, both Exxon AND Chevron automatically go down in that scenario, while Pfizer stays unaffected. Without it, results would be meaningless.",
-                inProject: "Used inside risk_engine.py in the run_monte_carlo() function. The specific line is L = np.linalg.cholesky(cov_matrix).",
+                explanation: "When running the backtest, we generate random numbers for each bond's performance every month. But we can't just roll a separate dice for each bond independently — because Exxon and Chevron always crash together (they're both oil). If the simulation randomly shows Exxon crashing but Chevron thriving, it's producing garbage. Cholesky decomposition takes the covariance matrix and uses it to 'link' the random numbers together so correlated bonds always move in sync, just like in real life.",
+                example: "The backtest randomly generates a bad month for oil. Thanks to Cholesky, both Exxon AND Chevron automatically go down in that month, while Pfizer stays unaffected. Without it, results would be meaningless.",
+                inProject: "Used inside risk_engine.py by run_backtest(), via the cached _cholesky_factor() helper. Monte Carlo doesn't need it: it only cares about the whole portfolio, whose return is a single normal with volatility √(wᵀΣw), so it draws that directly and reads VaR/CVaR off the tail with np.partition.",
             },
             {
                 term: "Stress Testing",
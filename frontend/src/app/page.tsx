@@ -103,7 +103,7 @@ const capabilities = [
   {
     k: "02",
     title: "Monte Carlo VaR",
-    body: "10,000-path simulation with Cholesky decomposition for Value-at-Risk and Expected Shortfall at 95% and 99% confidence.",
+    body: "10,000-path simulation of the portfolio return distribution for Value-at-Risk and Expected Shortfall at 95% and 99% confidence.",
   },
   {
     k: "03",
@@ -10,6 +10,7 @@ is exact. No network, no FRED, no live calls — market data is a static asset.
 
 import logging
 import os
+import threading
 
 import pandas as pd
 
@@ -19,7 +20,23 @@ logger = logging.getLogger(__name__)
 # Real Bond Data Loader
 # ---------------------------------------------------------------------------
 
+# Explicit schema for real_bonds.csv: only the columns the loader uses are
+# parsed, with no dtype inference pass. Sector and Rating are low-cardinality
+# labels, so they are read straight into categorical columns (small integer
+# codes; rating lookups and factorizing touch only the categories).
+_CSV_DTYPES = {
+    "CUSIP": str,
+    "Issuer": str,
+    "Sector": "category",
+    "Rating": "category",
+    "Yield": "float64",
+    "Duration": "float64",
+    "Price": "float64",
+    "Volatility": "float64",
+}
+
 _real_bonds_cache = {"data": None}
+_real_bonds_lock = threading.Lock()
 
 
 def load_real_bonds() -> pd.DataFrame:
@@ -33,9 +50,14 @@ def load_real_bonds() -> pd.DataFrame:
     regenerated — so the value is deterministic across numpy versions and
     identical under CPython and Pyodide.
     """
-    if _real_bonds_cache["data"] is not None:
+    with _real_bonds_lock:
+        if _real_bonds_cache["data"] is None:
+            _real_bonds_cache["data"] = _read_real_bonds_csv()
         return _real_bonds_cache["data"]
 
+
+def _read_real_bonds_csv() -> pd.DataFrame:
+    """Parses data/real_bonds.csv into the synthetic column layout (uncached)."""
     csv_path = os.path.join(os.path.dirname(__file__), "data", "real_bonds.csv")
 
     if not os.path.exists(csv_path):
@@ -44,7 +66,9 @@ def load_real_bonds() -> pd.DataFrame:
             "Please ensure data/real_bonds.csv exists."
         )
 
-    df = pd.read_csv(csv_path)
+    # Callable usecols skips absent columns instead of raising, so a CSV
+    # without Volatility still reaches the explicit error below.
+    df = pd.read_csv(csv_path, usecols=lambda c: c in _CSV_DTYPES, dtype=_CSV_DTYPES)
 
     if "Volatility" not in df.columns:
         raise ValueError(
@@ -52,7 +76,7 @@ def load_real_bonds() -> pd.DataFrame:
             "Re-run scripts/bake_real_bonds.py to regenerate it."
         )
 
-    result = pd.DataFrame({
+    return pd.DataFrame({
         "Bond_ID": df["CUSIP"],
         "Company": df["Issuer"],
         "Sector": df["Sector"],
@@ -63,9 +87,6 @@ def load_real_bonds() -> pd.DataFrame:
         "Price": df["Price"].round(2),
     })
 
-    _real_bonds_cache["data"] = result
-    return result
-
 
 def get_data_source_info() -> dict:
     """
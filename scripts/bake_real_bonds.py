@@ -36,15 +36,15 @@ _RATING_VOL_MAP = {
 def compute_volatility(df: pd.DataFrame) -> pd.Series:
     """The exact historical formula, seeded so the bake is reproducible."""
     rng = np.random.default_rng(42)
-    return df.apply(
-        lambda row: round(
-            _RATING_VOL_MAP.get(row["Rating"], 0.10)
-            + (row["Duration"] / 30.0) * 0.03
-            + float(rng.uniform(-0.005, 0.005)),
-            4,
-        ),
-        axis=1,
+    # One vector draw yields the same stream as the historical per-row
+    # scalar draws; Python's round() is kept per value so ties round the
+    # same way they always have.
+    raw = (
+        df["Rating"].map(_RATING_VOL_MAP).fillna(0.10).to_numpy(dtype=float)
+        + (df["Duration"].to_numpy(dtype=float) / 30.0) * 0.03
+        + rng.uniform(-0.005, 0.005, len(df))
     )
+    return pd.Series([round(v, 4) for v in raw.tolist()], index=df.index)
 
 
 def main() -> int:
@@ -43,18 +43,48 @@ def fit_treasury_from_yf() -> dict:
         float(data.get("^TYX", 4.5)) / 100.0,
     ])
 
-    guess = [0.05, -0.01, 0.01, 0.5]
-    bounds = ([0.0, -0.2, -0.2, 0.01], [0.2, 0.2, 0.2, 5.0])
-    opt_params, _ = curve_fit(nelson_siegel, maturities, rates, p0=guess, bounds=bounds)
-
     return {
         "maturities": maturities.tolist(),
         "rates": rates.tolist(),
-        "ns_params": opt_params.tolist(),
+        "ns_params": fit_nelson_siegel(maturities, rates, _load_previous_snapshot()),
         "timestamp": time.time(),
     }
 
 
+def fit_nelson_siegel(maturities, rates, previous=None) -> list:
+    """
+    Least-squares Nelson-Siegel fit. The fit is deterministic in its inputs,
+    so if the curve matches the previous snapshot (common on intraday re-runs)
+    its ns_params are reused instead of re-running curve_fit.
+    """
+    if previous and _same_curve(previous, maturities, rates):
+        return list(previous["ns_params"])
+
+    guess = [0.05, -0.01, 0.01, 0.5]
+    bounds = ([0.0, -0.2, -0.2, 0.01], [0.2, 0.2, 0.2, 5.0])
+    opt_params, _ = curve_fit(nelson_siegel, maturities, rates, p0=guess, bounds=bounds)
+    return opt_params.tolist()
+
+
+def _same_curve(snapshot: dict, maturities, rates) -> bool:
+    try:
+        return (
+            np.round(snapshot["maturities"], 6).tolist() == np.round(maturities, 6).tolist()
+            and np.round(snapshot["rates"], 6).tolist() == np.round(rates, 6).tolist()
+            and len(snapshot["ns_params"]) == 4
+        )
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def _load_previous_snapshot() -> dict:
+    try:
+        with open(SNAPSHOT_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
 def main() -> int:
     try:
         snapshot = fit_treasury_from_yf()
@@ -9,13 +9,24 @@ worker imports verbatim, so server == browser by construction.
 Run locally / in CI only:  uvicorn server:app
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Query
 from pydantic import BaseModel, Field
 from typing import List, Literal, Optional
 
 import core_api
 
-app = FastAPI(title="OptiMarket API (parity oracle)", version="3.0.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Same warm-up the browser worker runs at boot, so the first oracle
+    # request is a cache hit instead of a cold SLSQP solve.
+    core_api.prewarm()
+    yield
+
+
+app = FastAPI(title="OptiMarket API (parity oracle)", version="3.0.0", lifespan=lifespan)
 
 # --- Request models ---
 # Kept so the oracle validates exactly as the old hosted API did; the bounds
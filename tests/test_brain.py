@@ -55,6 +55,19 @@ class TestPortfolioMetrics:
         neg_sharpe = brain.negative_sharpe_ratio(weights, returns, cov, 0.02)
         assert neg_sharpe < 0  # Should be negative since return > Rf
 
+    def test_negative_sharpe_gradient_matches_finite_difference(self):
+        weights = np.array([0.2, 0.5, 0.3])
+        returns = np.array([0.05, 0.06, 0.04])
+        cov = np.array([[0.04, 0.01, 0.0], [0.01, 0.09, 0.02], [0.0, 0.02, 0.05]])
+        grad = brain.negative_sharpe_gradient(weights, returns, cov, 0.01)
+        h = 1e-7
+        for i in range(3):
+            bump = np.zeros(3)
+            bump[i] = h
+            fd = (brain.negative_sharpe_ratio(weights + bump, returns, cov, 0.01)
+                  - brain.negative_sharpe_ratio(weights - bump, returns, cov, 0.01)) / (2 * h)
+            assert abs(grad[i] - fd) < 1e-6
+
 
 class TestOptimizer:
     def test_maximize_yield_basic(self, sample_bonds):
@@ -122,6 +135,19 @@ class TestOptimizer:
             total_invested = result_df["Investment ($)"].sum()
             assert total_invested <= capital * 1.01
 
+    def test_precomputed_covariance_matches(self, sample_bonds):
+        cov = data_loader.generate_covariance_matrix(sample_bonds)
+        _, rebuilt = brain.run_solver(
+            sample_bonds, target_duration=5.0, capital=100000,
+            max_allocation=0.5, objective_type="Optimize Sharpe Ratio"
+        )
+        _, passed = brain.run_solver(
+            sample_bonds, target_duration=5.0, capital=100000,
+            max_allocation=0.5, objective_type="Optimize Sharpe Ratio",
+            cov_matrix=cov
+        )
+        assert passed == rebuilt
+
 
 class TestCovarianceMatrix:
     def test_covariance_shape(self, sample_bonds):
@@ -145,6 +171,27 @@ class TestCovarianceMatrix:
         corr_diff = cov[0, 3] / (np.sqrt(cov[0, 0]) * np.sqrt(cov[3, 3]))
         assert corr_same > corr_diff
 
+    def test_correlation_structure_matches_model(self, sample_bonds):
+        """0.25 base, +0.30 same sector, +0.15 same IG tier, unit diagonal."""
+        cov = data_loader.generate_covariance_matrix(sample_bonds)
+        vols = sample_bonds["Volatility"].values
+        corr = (cov - np.eye(len(vols)) * 1e-8) / np.outer(vols, vols)
+        assert np.allclose(np.diag(corr), 1.0)
+        assert abs(corr[0, 1] - 0.70) < 1e-12  # Apple/Microsoft: sector + tier
+        assert abs(corr[0, 2] - 0.40) < 1e-12  # Apple/JPMorgan: tier only
+
+    def test_covariance_memoized_and_read_only(self, sample_bonds):
+        cov1 = data_loader.generate_covariance_matrix(sample_bonds)
+        cov2 = data_loader.generate_covariance_matrix(sample_bonds.copy())
+        assert cov1 is cov2
+        assert not cov1.flags.writeable
+
+    def test_subset_slice_equals_rebuild(self, sample_bonds):
+        keep = np.array([True, False, True, True, False])
+        full = data_loader.generate_covariance_matrix(sample_bonds)
+        rebuilt = data_loader.generate_covariance_matrix(sample_bonds[keep])
+        assert np.array_equal(full[np.ix_(keep, keep)], rebuilt)
+
 
 class TestEfficientFrontier:
     def test_frontier_generation(self, sample_bonds):
@@ -161,6 +208,33 @@ class TestEfficientFrontier:
             assert "Volatility" in frontier[0]
             assert "Sharpe Ratio" in frontier[0]
 
+    def test_frontier_skips_unreachable_durations(self, sample_bonds):
+        frontier = brain.generate_efficient_frontier(
+            sample_bonds, capital=100000, max_alloc=0.5,
+            max_junk=0.3, max_sector=0.5,
+            junk_ratings=["BB", "B", "CCC", "D"],
+            risk_free_rate=0.01
+        )
+        for point in frontier:
+            assert 3.0 <= point["Target Duration"] <= 7.0
+
+    def test_frontier_ignores_index_labels(self, sample_bonds):
+        """The warm start is positional, so a duplicated index is harmless."""
+        kwargs = dict(capital=100000, max_alloc=0.5, max_junk=0.3, max_sector=0.5,
+                      junk_ratings=["BB", "B", "CCC", "D"], risk_free_rate=0.01)
+        expected = brain.generate_efficient_frontier(sample_bonds, **kwargs)
+        relabeled = sample_bonds.set_axis([0] * len(sample_bonds))
+        assert brain.generate_efficient_frontier(relabeled, **kwargs) == expected
+
+    def test_warm_start_from_optimum_reproduces_it(self, sample_bonds):
+        kwargs = dict(target_duration=5.0, capital=100000, max_allocation=0.5,
+                      objective_type="Optimize Sharpe Ratio")
+        result_df, metrics = brain.run_solver(sample_bonds, **kwargs)
+        warm = np.zeros(len(sample_bonds))
+        warm[sample_bonds.index.get_indexer(result_df.index)] = result_df["Allocation %"] / 100
+        _, warm_metrics = brain.run_solver(sample_bonds, initial_weights=warm, **kwargs)
+        assert warm_metrics["Sharpe Ratio"] == pytest.approx(metrics["Sharpe Ratio"], rel=1e-4)
+
 
 class TestOptimizerKnownAnswers:
     """
@@ -9,6 +9,9 @@ the frontend's TypeScript interfaces expect.
 import os
 import sys
 
+import numpy as np
+import pandas as pd
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 import core_api
 
@@ -29,6 +32,28 @@ def test_optimize_default_shape():
         assert k in r["allocations"]
 
 
+def test_optimize_allocations_match_portfolio():
+    r = core_api.optimize({})
+    for key, column in (("by_rating", "Rating"), ("by_sector", "Sector"),
+                        ("by_company", "Company")):
+        expected = {}
+        for bond in r["portfolio"]:
+            expected[bond[column]] = expected.get(bond[column], 0.0) + bond["Allocation %"]
+        rows = r["allocations"][key]
+        assert [row[column] for row in rows] == sorted(expected)
+        for row in rows:
+            assert abs(row["Allocation %"] - expected[row[column]]) < 1e-9
+
+
+def test_allocation_by_drops_missing_labels():
+    column = pd.Series(["A", np.nan, "B", "A"], name="Rating")
+    rows = core_api._allocation_by(column, np.array([10.0, 20.0, 30.0, 5.0]))
+    assert rows == [
+        {"Rating": "A", "Allocation %": 15.0},
+        {"Rating": "B", "Allocation %": 30.0},
+    ]
+
+
 def test_optimize_applies_defaults_for_partial_params():
     r = core_api.optimize({"target_duration": 6.0})
     assert r["success"] is True
@@ -100,3 +125,14 @@ def test_server_oracle_matches_core_api():
     assert resp.status_code == 200
     direct = core_api.optimize({"target_duration": 5.0})
     assert resp.json()["metrics"] == direct["metrics"]
+
+
+def test_server_startup_prewarms(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import server
+
+    calls = []
+    monkeypatch.setattr(core_api, "prewarm", lambda: calls.append(1))
+    with TestClient(server.app):
+        assert calls == [1]
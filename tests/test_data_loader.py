@@ -19,7 +19,6 @@ class TestSyntheticBondGeneration:
         assert len(df) == 50
 
     def test_default_count(self):
-        data_loader._bond_market_cache = {"data": None, "timestamp": 0}
         df = data_loader.generate_bond_market(data_source="synthetic")
         assert len(df) == 150
 
@@ -44,12 +43,18 @@ class TestSyntheticBondGeneration:
 
     def test_reproducibility(self):
         """Synthetic bonds should be reproducible with fixed seed."""
-        data_loader._bond_market_cache = {"data": None, "timestamp": 0}
+        data_loader._synthetic_market.cache_clear()
         df1 = data_loader.generate_bond_market(n_bonds=10, data_source="synthetic")
-        data_loader._bond_market_cache = {"data": None, "timestamp": 0}
+        data_loader._synthetic_market.cache_clear()
         df2 = data_loader.generate_bond_market(n_bonds=10, data_source="synthetic")
         pd.testing.assert_frame_equal(df1, df2)
 
+    def test_cached_per_size(self):
+        df10 = data_loader.generate_bond_market(n_bonds=10, data_source="synthetic")
+        df20 = data_loader.generate_bond_market(n_bonds=20, data_source="synthetic")
+        assert len(df10) == 10 and len(df20) == 20
+        assert data_loader.generate_bond_market(n_bonds=10, data_source="synthetic") is df10
+
 
 class TestRealBondData:
     def test_loads_csv(self):
@@ -101,3 +106,10 @@ class TestNelsonSiegel:
         yields = [data_loader.nelson_siegel(t, 0.05, -0.02, 0.01, 0.5) for t in maturities]
         # Generally upward sloping (may not be strictly monotonic)
         assert yields[-1] > yields[0]
+
+    def test_array_matches_scalar(self):
+        maturities = np.array([0.0, 1.0, 5.0, 10.0, 30.0])
+        params = (0.05, -0.02, 0.01, 0.5)
+        curve = data_loader.nelson_siegel(maturities, *params)
+        expected = [data_loader.nelson_siegel(t, *params) for t in maturities]
+        np.testing.assert_array_equal(curve, expected)
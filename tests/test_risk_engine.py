@@ -13,9 +13,9 @@ import risk_engine
 import data_loader
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def portfolio():
-    """Create a small portfolio for testing."""
+    """Create a small portfolio for testing (shared: tests must not mutate it)."""
     df = pd.DataFrame({
         "Bond_ID": ["B001", "B002", "B003"],
         "Company": ["Apple", "Microsoft", "JPMorgan"],
@@ -30,10 +30,16 @@ def portfolio():
     return df, weights
 
 
+@pytest.fixture(scope="module")
+def portfolio_with_cov(portfolio):
+    """The test portfolio plus its covariance matrix."""
+    df, weights = portfolio
+    return df, weights, data_loader.generate_covariance_matrix(df)
+
+
 class TestMonteCarlo:
-    def test_basic_run(self, portfolio):
-        df, weights = portfolio
-        cov = data_loader.generate_covariance_matrix(df)
+    def test_basic_run(self, portfolio_with_cov):
+        df, weights, cov = portfolio_with_cov
         result = risk_engine.run_monte_carlo(
             weights, df["Yield"].values, cov,
             capital=100000, n_simulations=1000
@@ -43,19 +49,17 @@ class TestMonteCarlo:
         assert "95%" in result["var_cvar"]
         assert result["n_simulations"] == 1000
 
-    def test_var_positive(self, portfolio):
-        df, weights = portfolio
-        cov = data_loader.generate_covariance_matrix(df)
+    def test_var_positive(self, portfolio_with_cov):
+        df, weights, cov = portfolio_with_cov
         result = risk_engine.run_monte_carlo(
             weights, df["Yield"].values, cov,
             capital=100000, n_simulations=5000
         )
         assert result["var_cvar"]["95%"]["VaR_dollar"] >= 0
 
-    def test_cvar_geq_var(self, portfolio):
+    def test_cvar_geq_var(self, portfolio_with_cov):
         """CVaR should always be >= VaR."""
-        df, weights = portfolio
-        cov = data_loader.generate_covariance_matrix(df)
+        df, weights, cov = portfolio_with_cov
         result = risk_engine.run_monte_carlo(
             weights, df["Yield"].values, cov,
             capital=100000, n_simulations=5000
@@ -63,9 +67,37 @@ class TestMonteCarlo:
         for level in ["90%", "95%", "99%"]:
             assert result["var_cvar"][level]["CVaR_dollar"] >= result["var_cvar"][level]["VaR_dollar"]
 
-    def test_histogram_bins(self, portfolio):
-        df, weights = portfolio
-        cov = data_loader.generate_covariance_matrix(df)
+    def test_var_percent_consistent_with_dollars(self, portfolio_with_cov):
+        """Return VaR is the log-return of the same order statistic as dollar VaR."""
+        df, weights, cov = portfolio_with_cov
+        capital = 100000
+        result = risk_engine.run_monte_carlo(
+            weights, df["Yield"].values, cov,
+            capital=capital, n_simulations=5000
+        )
+        for level in ["90%", "95%", "99%"]:
+            row = result["var_cvar"][level]
+            implied = -capital * np.expm1(-row["VaR_percent"] / 100)
+            assert abs(implied - row["VaR_dollar"]) < 0.01 * capital / 100
+
+    def test_simulated_spread_matches_portfolio_vol(self, portfolio_with_cov, monkeypatch):
+        """The direct portfolio-level draw has the analytic sqrt(w'Cw) spread."""
+        df, weights, cov = portfolio_with_cov
+        monkeypatch.setattr(risk_engine, "_mc_rng", np.random.default_rng(7))
+        capital = 100000
+        result = risk_engine.run_monte_carlo(
+            weights, df["Yield"].values, cov,
+            capital=capital, n_simulations=50000
+        )
+        # 1-year horizon: log-returns are normal with std port_vol, and the
+        # 5% quantile sits 1.645 sigma below the mean.
+        port_vol = np.sqrt(weights @ cov @ weights)
+        mu = weights @ df["Yield"].values - 0.5 * port_vol**2
+        expected_var = -capital * np.expm1(mu - 1.6449 * port_vol)
+        assert result["var_cvar"]["95%"]["VaR_dollar"] == pytest.approx(expected_var, rel=0.03)
+
+    def test_histogram_bins(self, portfolio_with_cov):
+        df, weights, cov = portfolio_with_cov
         result = risk_engine.run_monte_carlo(
             weights, df["Yield"].values, cov, n_simulations=1000
         )
@@ -105,6 +137,30 @@ class TestStressTest:
         assert "base_portfolio" in result
         assert result["base_portfolio"]["yield"] > 0
 
+    def test_flight_to_quality_splits_ig_and_hy(self, portfolio):
+        """IG spreads tighten by 0.7x while the BB bond's widen by 2.5x."""
+        df, weights = portfolio
+        df = df.assign(Rating=["AA", "AAA", "BB"], Yield=[0.04, 0.045, 0.06])
+        result = risk_engine.run_stress_test(
+            df, weights, capital=100000,
+            scenarios=["flight_to_quality"]
+        )
+        scenario = result["scenarios"][0]
+        # Per-bond shifts: -150bp plus spread change of -21bp, -15bp, +525bp.
+        assert scenario["stressed_yield"] == 4.75
+        assert scenario["yield_change_bp"] == -4.8
+
+    def test_rating_codes_index_lookup_tables(self):
+        codes = risk_engine._rating_codes(pd.Series(["AAA", "BBB-", "BB", "NR"]))
+        assert codes.tolist() == [0, 9, 10, -1]
+        assert risk_engine.SPREAD_LUT[codes].tolist() == [0.005, 0.020, 0.035, 0.015]
+        assert risk_engine.IG_MASK[codes].tolist() == [True, True, False, False]
+
+    def test_rating_codes_categorical_matches_object(self):
+        ratings = pd.Series(["BB", "AAA", None, "NR", "AAA"])
+        expected = risk_engine._rating_codes(ratings)
+        assert risk_engine._rating_codes(ratings.astype("category")).tolist() == expected.tolist()
+
 
 class TestBacktest:
     def test_basic_run(self, portfolio):
@@ -134,3 +190,36 @@ class TestBacktest:
         result = risk_engine.run_backtest(df, weights, capital=100000)
         assert "alpha_vs_benchmark" in result["summary"]
         assert "alpha_vs_riskfree" in result["summary"]
+
+    def test_cholesky_factor_memoized(self, portfolio_with_cov):
+        df, _, cov = portfolio_with_cov
+        L = risk_engine._cholesky_factor(cov)
+        assert risk_engine._cholesky_factor(cov.copy()) is L
+        assert not L.flags.writeable
+        assert np.allclose(L @ L.T, cov + np.eye(len(cov)) * 1e-8)
+
+    def test_cholesky_factor_non_pd_keeps_correlation(self):
+        # Pairwise correlations 0.9/0.9/-0.9 cannot coexist: not PSD.
+        corr = np.array([[1.0, 0.9, 0.9], [0.9, 1.0, -0.9], [0.9, -0.9, 1.0]])
+        cov = corr * 0.01
+        L = risk_engine._cholesky_factor(cov)
+        implied = L @ L.T
+        assert np.all(np.linalg.eigvalsh(implied) > -1e-12)
+        assert implied[0, 1] > 0 and implied[1, 2] < 0
+
+    def test_max_drawdown(self):
+        assert risk_engine._max_drawdown([100, 120, 90, 130, 117]) == pytest.approx(0.25)
+        assert risk_engine._max_drawdown([100, 101, 102]) == 0.0
+
+    def test_realized_sharpe_matches_mean_std(self):
+        r = np.random.default_rng(0).normal(0.004, 0.01, 12)
+        expected = (r.mean() * 12 - 0.04) / (r.std() * np.sqrt(12))
+        assert risk_engine._realized_sharpe(r, 12, 0.04) == pytest.approx(expected)
+        assert risk_engine._realized_sharpe(np.array([]), 12, 0.04) == 0.0
+
+    def test_realized_sharpe_small_dispersion(self):
+        r = 3e-3 + np.random.default_rng(1).normal(0.0, 1e-9, 12)
+        expected = (r.mean() * 12 - 0.04) / (r.std() * np.sqrt(12))
+        assert risk_engine._realized_sharpe(r, 12, 0.04) == pytest.approx(expected, rel=1e-9)
+        for c in (3e-3, 0.1 / 3, 1e-7):
+            assert risk_engine._realized_sharpe(np.full(12, c), 12, 0.04) == 0.0